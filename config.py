@@ -18,4 +18,39 @@ SUBTITLES_DIR = os.path.join(BASE_DOWNLOAD_DIR, 'subtitles')
 
 # Create all subdirectories
 for directory in [VIDEOS_DIR, AUDIOS_DIR, SUBTITLES_DIR]:
-    os.makedirs(directory, exist_ok=True) 
\ No newline at end of file
+    os.makedirs(directory, exist_ok=True)
+
+# Number of upcoming URLs whose page/API metadata is resolved in the background
+# while the current entry is downloading (0 disables prefetching)
+PREFETCH_LOOKAHEAD = int(os.getenv('PREFETCH_LOOKAHEAD', '3'))
+
+# Network timeouts in seconds: time to establish a connection, and maximum
+# silence between two reads on an open connection
+CONNECT_TIMEOUT = float(os.getenv('CONNECT_TIMEOUT', '10'))
+READ_TIMEOUT = float(os.getenv('READ_TIMEOUT', '30'))
+
+# Stall watchdog: a transfer averaging less than MIN_THROUGHPUT bytes/s over
+# STALL_WINDOW seconds is dropped and resumed from its current offset on a
+# fresh connection, at most MAX_RECONNECTS times per file
+MIN_THROUGHPUT = int(os.getenv('MIN_THROUGHPUT', str(32 * 1024)))
+STALL_WINDOW = float(os.getenv('STALL_WINDOW', '20'))
+MAX_RECONNECTS = int(os.getenv('MAX_RECONNECTS', '5'))
+
+# Hash computed while each file streams in, stored next to it for later verification
+CHECKSUM_ALGORITHM = os.getenv('CHECKSUM_ALGORITHM', 'sha256')
+
+# Where downloads are written: 'local' (the directories above) or 's3' (an
+# S3-compatible bucket such as AWS S3 or MinIO, streamed without local staging)
+OUTPUT_SINK = os.getenv('OUTPUT_SINK', 'local')
+S3_BUCKET = os.getenv('S3_BUCKET', '')
+S3_PREFIX = os.getenv('S3_PREFIX', '')
+S3_ENDPOINT_URL = os.getenv('S3_ENDPOINT_URL', '')
+S3_PART_SIZE = int(os.getenv('S3_PART_SIZE', str(8 * 1024 * 1024)))
+S3_MAX_PENDING_PARTS = int(os.getenv('S3_MAX_PENDING_PARTS', '2'))
+
+# SQLite full-text index of downloaded caption cues, updated as captions arrive
+TRANSCRIPT_INDEX_PATH = os.getenv('TRANSCRIPT_INDEX_PATH', os.path.join(BASE_DOWNLOAD_DIR, 'transcripts.db'))
+INDEX_TRANSCRIPTS = os.getenv('INDEX_TRANSCRIPTS', 'true').lower() in ('1', 'true', 'yes')
+
+# Assets of one entry (video, audio, each caption language) downloaded concurrently
+ASSET_WORKERS = int(os.getenv('ASSET_WORKERS', '3'))
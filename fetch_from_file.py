@@ -1,17 +1,21 @@
 import argparse
-from learn_video_helper import VideoDownloader
+from config import PREFETCH_LOOKAHEAD
+from learn_video_helper import iter_prefetched
+from sync import sync_links
 
 
-def process_links_from_file(file_path, preferred_languages):
+def read_links(file_path):
     with open(file_path, 'r') as file:
-        links = file.readlines()
+        return [line.strip() for line in file if line.strip()]
 
-    for link in links:
-        link = link.strip()
-        print(f"Processing link: {link}")
 
-        downloader = VideoDownloader(link)
-        downloader.run(
+def process_links_from_file(file_path, preferred_languages, lookahead=PREFETCH_LOOKAHEAD):
+    links = read_links(file_path)
+
+    for downloader in iter_prefetched(links, lookahead):
+        print(f"Processing link: {downloader.url}")
+
+        result = downloader.run(
             download_high_quality=True,
             download_medium_quality=False,
             download_low_quality=False,
@@ -19,15 +23,23 @@ def process_links_from_file(file_path, preferred_languages):
             download_captions=True,
             preferred_languages=preferred_languages
         )
+        print(result.summary())
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Download videos from Microsoft Learn.')
     parser.add_argument('file_path', type=str, help='Path to the text file containing links')
     parser.add_argument('--languages', nargs='+', default=['en-us'], help='Preferred languages for subtitles')
+    parser.add_argument('--sync', action='store_true',
+                        help='Only fetch new or changed files and print a diff report against earlier downloads')
+    parser.add_argument('--lookahead', type=int, default=PREFETCH_LOOKAHEAD,
+                        help='Number of upcoming links to resolve while downloading (0 to disable)')
     args = parser.parse_args()
 
     file_path = args.file_path
     preferred_languages = args.languages
 
-    process_links_from_file(file_path, preferred_languages)
+    if args.sync:
+        sync_links(read_links(file_path), preferred_languages, args.lookahead)
+    else:
+        process_links_from_file(file_path, preferred_languages, args.lookahead)
@@ -1,7 +1,8 @@
 import gradio as gr
 from fetch_from_file import process_links_from_file
-from learn_video_helper import VideoDownloader
+from learn_video_helper import iter_prefetched
 from url_generator import generate_urls_from_pattern
+from transcript_index import search, index_tree, format_offset
 import tempfile
 import os
 import io
@@ -39,7 +40,8 @@ def process_manual_urls_stream(urls_text, languages, download_types):
     download_audio = "Audio" in download_types
     download_captions = "Subtitles" in download_types
 
-    for idx, url in enumerate(urls, 1):
+    for idx, downloader in enumerate(iter_prefetched(urls), 1):
+        url = downloader.url
         log_lines = [f"🔗 Processing URL {idx}/{total}: {url}"]
         yield "\n".join(log_lines), int((idx - 1) / total * 100)
 
@@ -47,7 +49,6 @@ def process_manual_urls_stream(urls_text, languages, download_types):
             log_lines.append(msg)
 
         try:
-            downloader = VideoDownloader(url)
             for percent in run_with_yield_callback(
                 downloader,
                 languages,
@@ -97,7 +98,7 @@ def run_with_yield_callback(
 
         # Fixed: proper callback handling
         try:
-            downloader.run_with_callback(
+            result = downloader.run_with_callback(
                 download_high_quality=download_high_quality,
                 download_medium_quality=False,  # Always False - smart fallback in VideoDownloader
                 download_low_quality=False,     # Always False - smart fallback in VideoDownloader
@@ -106,6 +107,7 @@ def run_with_yield_callback(
                 preferred_languages=languages,
                 progress_callback=lambda msg: [inner_callback(msg)]  # Fixed callback
             )
+            callback_fn(result.summary())
             yield 100
         except Exception as e:
             callback_fn(f"❌ Download failed: {e}")
@@ -135,7 +137,8 @@ def process_generated_urls_stream(sample_url1, sample_url2, num_links, languages
     download_captions = "Subtitles" in download_types
 
     total = len(urls)
-    for idx, url in enumerate(urls, 1):
+    for idx, downloader in enumerate(iter_prefetched(urls), 1):
+        url = downloader.url
         log_lines.append(f"🔗 Processing URL {idx}/{total}: {url}")
         yield "\n".join(log_lines), int(5 + (idx - 1) / total * 95)
 
@@ -143,7 +146,6 @@ def process_generated_urls_stream(sample_url1, sample_url2, num_links, languages
             log_lines.append(msg)
 
         try:
-            downloader = VideoDownloader(url)
             for percent in run_with_yield_callback(
                 downloader,
                 languages,
@@ -189,7 +191,8 @@ def process_from_file_stream(file_obj, languages, download_types):
         download_captions = "Subtitles" in download_types
 
         total = len(urls)
-        for idx, url in enumerate(urls, 1):
+        for idx, downloader in enumerate(iter_prefetched(urls), 1):
+            url = downloader.url
             log_lines.append(f"🔗 Processing URL {idx}/{total}: {url}")
             yield "\n".join(log_lines), int(5 + (idx - 1) / total * 95)
 
@@ -197,7 +200,6 @@ def process_from_file_stream(file_obj, languages, download_types):
                 log_lines.append(msg)
 
             try:
-                downloader = VideoDownloader(url)
                 for percent in run_with_yield_callback(
                     downloader,
                     languages,
@@ -221,6 +223,19 @@ def process_from_file_stream(file_obj, languages, download_types):
     finally:
         os.remove(temp_path)
 
+def search_transcripts(query, limit):
+    """Search downloaded captions and return rows for the results table"""
+    results = search(query, int(limit or 20))
+    return [
+        [r['title'], r['language'], r['start_ms'], format_offset(r['start_ms']), r['text']]
+        for r in results
+    ]
+
+def update_transcript_index():
+    """Index caption files that are new or changed since the last update"""
+    indexed, unchanged, removed = index_tree()
+    return f"📚 Indexed {indexed} files, {unchanged} unchanged, {removed} removed"
+
 # Create interface - KEEP SAME LAYOUT AS CURRENT
 with gr.Blocks() as demo:
     gr.Markdown("# Microsoft Learn Downloader Interface\nChoose a method to download videos, audio, and subtitles.")
@@ -315,5 +330,25 @@ with gr.Blocks() as demo:
             outputs=[log_output3, progress3]
         )
 
+    with gr.Tab("Search Transcripts"):
+        search_input = gr.Textbox(
+            label="Search downloaded captions",
+            placeholder="e.g. language models"
+        )
+        limit_input = gr.Number(label="Maximum results", precision=0, value=20)
+        btn_search = gr.Button("Search")
+        search_results = gr.Dataframe(
+            headers=["Video", "Language", "Offset (ms)", "Time", "Caption"],
+            interactive=False
+        )
+        btn_search.click(
+            fn=search_transcripts,
+            inputs=[search_input, limit_input],
+            outputs=[search_results]
+        )
+        index_status = gr.Textbox(label="Index status", lines=1)
+        btn_index = gr.Button("Update Index")
+        btn_index.click(fn=update_transcript_index, inputs=[], outputs=[index_status])
+
 if __name__ == "__main__":
     demo.launch()
\ No newline at end of file
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+from config import CHECKSUM_ALGORITHM
+
+# Checksum and size of each download are stored next to it as <file>.meta.json
+SIDECAR_SUFFIX = '.meta.json'
+# Downloads in progress are written to <file>.part and renamed once complete
+PART_SUFFIX = '.part'
+
+
+def new_hasher(algorithm=CHECKSUM_ALGORITHM):
+    return hashlib.new(algorithm)
+
+
+def sidecar_path(path):
+    return path + SIDECAR_SUFFIX
+
+
+def is_sidecar(path):
+    return path.endswith(SIDECAR_SUFFIX)
+
+
+def is_temporary(path):
+    return path.endswith((PART_SUFFIX, '.tmp'))
+
+
+def read_sidecar(path):
+    """Returns the metadata stored next to `path`, or None if there is none (or it is unreadable)."""
+    try:
+        with open(sidecar_path(path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_sidecar(path, meta):
+    # Write to a temp file and rename, so a crash never leaves a half-written sidecar
+    target = sidecar_path(path)
+    temp = target + '.tmp'
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(temp, target)
+
+
+def remove_sidecar(path):
+    try:
+        os.remove(sidecar_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def hash_file(path, algorithm=CHECKSUM_ALGORITHM, chunk_size=1024 * 1024):
+    """Returns (hex digest, size in bytes) of the file at `path`."""
+    hasher = new_hasher(algorithm)
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            size += len(chunk)
+    return hasher.hexdigest(), size
+
+
+def verify_file(path):
+    """
+    Checks a downloaded file against its sidecar.
+    Returns (path, status, detail) where status is 'ok', 'corrupt' or 'unverified'.
+    """
+    meta = read_sidecar(path)
+    if not meta or 'checksum' not in meta:
+        return path, 'unverified', "no checksum recorded"
+
+    try:
+        checksum, size = hash_file(path, meta.get('algorithm', CHECKSUM_ALGORITHM))
+    except OSError as e:
+        return path, 'corrupt', str(e)
+
+    if size != meta.get('size'):
+        return path, 'corrupt', f"size {size} != expected {meta.get('size')}"
+    if checksum != meta['checksum']:
+        return path, 'corrupt', "checksum mismatch"
+    return path, 'ok', ""
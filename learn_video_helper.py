@@ -2,20 +2,108 @@ import requests
 from bs4 import BeautifulSoup
 import os
 import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from tqdm import tqdm
-from config import VIDEOS_DIR, AUDIOS_DIR, SUBTITLES_DIR
+from integrity import new_hasher
+from sinks import default_sink, LocalSink
+import transcript_index
+from tasks import AssetResult, AssetTask, EntryResult, run_tasks
+from config import (VIDEOS_DIR, AUDIOS_DIR, SUBTITLES_DIR, PREFETCH_LOOKAHEAD,
+                    CONNECT_TIMEOUT, READ_TIMEOUT, MIN_THROUGHPUT, STALL_WINDOW, MAX_RECONNECTS,
+                    INDEX_TRANSCRIPTS, ASSET_WORKERS)
+
+TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+
+CONTENT_RANGE = re.compile(r'bytes (\d+)-\d+/(\d+|\*)')
+
+
+class TransferStalled(requests.exceptions.RequestException):
+    """Raised when a transfer stays below MIN_THROUGHPUT for a whole STALL_WINDOW."""
+
+
+class StallWatchdog:
+    """
+    Watches a streaming response from a background thread. When fewer than `min_rate`
+    bytes/s arrived during a whole `window`, it records why and shuts the response down,
+    which unblocks a read that is still waiting for a chunk to fill. A trickle is therefore
+    caught after one window, however slowly the bytes come in.
+    """
+
+    def __init__(self, response, window, min_rate):
+        self.response = response
+        self.window = window
+        self.min_rate = min_rate
+        self.received = 0
+        self.stalled = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def add(self, count):
+        self.received += count
+
+    def _watch(self):
+        last = 0
+        while not self._stop.wait(self.window):
+            rate = (self.received - last) / self.window
+            last = self.received
+            if rate < self.min_rate:
+                self.stalled = f"throughput {rate / 1024:.1f} KB/s below {self.min_rate / 1024:.1f} KB/s"
+                # urllib3 >= 2.3 can interrupt a blocked read; closing is the best effort before that
+                shutdown = getattr(self.response.raw, 'shutdown', None) or self.response.close
+                shutdown()
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+
+
+def if_range_headers(headers):
+    """
+    Builds an If-Range header from the validators of the first response, so a resumed
+    request only gets a partial response if the asset has not changed in between.
+    Weak ETags are not allowed in If-Range, Last-Modified is used instead.
+    """
+    etag = headers.get('etag')
+    if etag and not etag.startswith('W/'):
+        return {'If-Range': etag}
+    if headers.get('last-modified'):
+        return {'If-Range': headers['last-modified']}
+    return {}
+
+
+def resumes_at(response, offset, total_size):
+    """True if `response` is a partial response continuing the same asset exactly at `offset`."""
+    if response.status_code != 206:
+        return False
+    match = CONTENT_RANGE.match(response.headers.get('content-range', ''))
+    if not match or int(match.group(1)) != offset:
+        return False
+    return not total_size or match.group(2) == '*' or int(match.group(2)) == total_size
 
 
 class VideoDownloader:
-    def __init__(self, url):
+    def __init__(self, url, sink=None, sync_report=None):
         self.url = url
+        self.sink = sink or default_sink()
+        # When a SyncReport is given, existing files are revalidated instead of re-downloaded
+        self.sync_report = sync_report
+        self._metadata = None
+        self._metadata_lock = threading.Lock()
 
     def fetch_entry_id_and_title(self):
         print("🌍 Requesting URL... 🔄")
         print(f"🔗 URL: {self.url}")  # Show the URL being processed
 
-        response = requests.get(self.url)
+        response = requests.get(self.url, timeout=TIMEOUT)
         if response.status_code != 200:
             print(f"❌ Failed to load page: {response.status_code}")
             return None, None
@@ -40,7 +128,7 @@ class VideoDownloader:
 
     def fetch_video_data(self, entry_id):
         api_url = f"https://learn.microsoft.com/api/video/public/v1/entries/{entry_id}?isAMS=false"
-        response = requests.get(api_url)
+        response = requests.get(api_url, timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
 
@@ -79,18 +167,120 @@ class VideoDownloader:
             print(f"⚠️ Failed to fetch video data: {response.status_code}")
             return None
 
-    def download_file(self, file_url, output_path, progress_callback=None):
+    def resolve(self):
+        """
+        Resolves page and entries API metadata for this URL.
+        Returns (title, public_video, error). The result is cached, so it can be
+        prefetched from another thread before run() is called.
+        """
+        with self._metadata_lock:
+            if self._metadata is None:
+                self._metadata = self._fetch_metadata()
+            return self._metadata
+
+    def _fetch_metadata(self):
+        # Network errors become an entry error, so one unreachable page doesn't stop a batch
+        try:
+            entry_id, title = self.fetch_entry_id_and_title()
+        except requests.exceptions.RequestException as e:
+            return None, None, f"❌ Failed to load page: {e}"
+        if not entry_id:
+            return title, None, "❌ Could not find entryId"
+
+        print(f"📝 Video title: {title}")
+
+        try:
+            video_data = self.fetch_video_data(entry_id)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return title, None, f"❌ Failed to fetch video data: {e}"
+        if not video_data:
+            return title, None, "❌ Failed to fetch video data"
+
+        if 'publicVideo' not in video_data:
+            return title, None, "❌ No video data in response"
+
+        return title, video_data['publicVideo'], None
+
+    def open_stream(self, file_url, offset=0, headers=None):
+        """Opens a streaming GET, asking for the bytes from `offset` onwards when resuming."""
+        headers = dict(headers or {})
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+        response = requests.get(file_url, stream=True, headers=headers, timeout=TIMEOUT)
+        response.raise_for_status()
+        return response
+
+    def previous_download(self, output_path):
+        """
+        Returns the sidecar metadata of an earlier download of `output_path`, or None if there is
+        no such file. Files downloaded before sidecars existed only get their size, which is then
+        compared with a HEAD request.
+        """
+        if not self.sink.exists(output_path):
+            return None
+        return self.sink.read_metadata(output_path) or {'size': self.sink.size(output_path)}
+
+    def open_if_changed(self, file_url, previous):
+        """
+        Opens `file_url` for download, or returns None when `previous` shows the copy on disk
+        is still current. Uses a conditional GET when an ETag or Last-Modified was recorded,
+        otherwise a HEAD request compared against the recorded size.
+        """
+        if not previous or previous.get('url', file_url) != file_url:
+            return self.open_stream(file_url)
+
+        etag = previous.get('etag')
+        last_modified = previous.get('last_modified')
+        if etag or last_modified:
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            response = self.open_stream(file_url, headers=headers)
+            # Some servers ignore conditional headers but still send the same ETag
+            if response.status_code == 304 or (etag and response.headers.get('etag') == etag):
+                response.close()
+                return None
+            return response
+
+        head = requests.head(file_url, timeout=TIMEOUT, allow_redirects=True)
+        if head.ok and int(head.headers.get('content-length', -1)) == previous.get('size'):
+            return None
+        return self.open_stream(file_url)
+
+    def download_file(self, file_url, output_path, progress_callback=None, position=None):
+        """
+        Streams `file_url` to `output_path`, hashing the bytes as they arrive. `position` pins the
+        progress bar to a terminal line when several downloads run at once.
+        Returns an AssetResult, which is truthy once the size matches content-length and the
+        checksum sidecar is written (or, when syncing, the existing copy is still current).
+        """
+        def log(msg):
+            if progress_callback:
+                progress_callback(msg)
+            else:
+                print(msg)
+
+        started = time.monotonic()
+        downloaded = 0
+        reconnects = 0
         print(f"📥 Downloading file from {file_url}...")
-        print(f"💾 Saving to: {output_path}")
+        print(f"💾 Saving to: {self.sink.describe(output_path)}")
 
         try:
-            response = requests.get(file_url, stream=True)
-            response.raise_for_status()
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            previous = self.previous_download(output_path) if self.sync_report is not None else None
+            response = self.open_if_changed(file_url, previous)
+            if response is None:
+                self.sync_report.record('unchanged', output_path)
+                log(f"✔️ Unchanged: {self.sink.describe(output_path)}")
+                return AssetResult(status='unchanged', path=output_path, elapsed=time.monotonic() - started)
 
             total_size = int(response.headers.get('content-length', 0))
-            chunk_size = 8192
-            downloaded = 0
+            validators = response.headers
+            # Chunks small enough that a transfer at the floor rate still completes several per window
+            chunk_size = max(1024, min(8192, int(MIN_THROUGHPUT * STALL_WINDOW) // 4))
+            hasher = new_hasher()
 
             # Show file size info
             if total_size > 0:
@@ -98,246 +288,278 @@ class VideoDownloader:
                 print(f"📦 File size: {size_mb:.1f} MB")
 
             # ALWAYS show tqdm in console, regardless of progress_callback
-            with open(output_path, 'wb') as f, tqdm(
-                    total=total_size, unit='B', unit_scale=True, desc="Downloading"
+            with self.sink.open(output_path) as writer, tqdm(
+                    total=total_size, unit='B', unit_scale=True, desc=os.path.basename(output_path)[:40],
+                    position=position, leave=position is None
             ) as progress_bar:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        progress_bar.update(len(chunk))
-
-                        # ALSO send progress to GUI if callback exists
-                        if progress_callback:
-                            downloaded += len(chunk)
-                            percent = downloaded / total_size * 100 if total_size else 0
-                            progress_callback(f"{os.path.basename(output_path)} — {percent:.1f}%")
-
-            msg = f"✅ Finished: {output_path}"
-            if progress_callback:
-                progress_callback(msg)
-            else:
-                print(msg)
-        except requests.exceptions.RequestException as e:
-            msg = f"❌ Error downloading file: {e}"
-            if progress_callback:
-                progress_callback(msg)
-            else:
-                print(msg)
+                while True:
+                    try:
+                        if response is None:
+                            response = self.open_stream(file_url, downloaded,
+                                                        if_range_headers(validators) if downloaded else None)
+                            if downloaded and not resumes_at(response, downloaded, total_size):
+                                # The server ignored the Range, sent another range, or the asset
+                                # changed since the first connection (If-Range failed). Never splice
+                                # two versions together: start over from the beginning
+                                log("⚠️ Cannot resume this transfer safely, restarting from the beginning")
+                                if response.status_code == 206:
+                                    response.close()
+                                    response = self.open_stream(file_url)
+                                total_size = int(response.headers.get('content-length', 0))
+                                validators = response.headers
+                                writer.restart()
+                                downloaded = 0
+                                hasher = new_hasher()
+                                progress_bar.reset(total=total_size)
+
+                        watchdog = StallWatchdog(response, STALL_WINDOW, MIN_THROUGHPUT)
+                        try:
+                            with watchdog:
+                                for chunk in response.iter_content(chunk_size=chunk_size):
+                                    if chunk:
+                                        writer.write(chunk)
+                                        hasher.update(chunk)
+                                        progress_bar.update(len(chunk))
+                                        downloaded += len(chunk)
+                                        watchdog.add(len(chunk))
+
+                                        # ALSO send progress to GUI if callback exists
+                                        if progress_callback:
+                                            percent = downloaded / total_size * 100 if total_size else 0
+                                            progress_callback(f"{os.path.basename(output_path)} — {percent:.1f}%")
+                        except requests.exceptions.RequestException as e:
+                            # The watchdog shutting the connection down surfaces as a broken read
+                            if watchdog.stalled:
+                                raise TransferStalled(watchdog.stalled) from e
+                            raise
+                        # A watchdog firing just as the last bytes arrived is not a stall
+                        if watchdog.stalled and not (total_size and downloaded >= total_size):
+                            raise TransferStalled(watchdog.stalled)
+                        break
+                    except (TransferStalled, requests.exceptions.ConnectionError,
+                            requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                        if response is not None:
+                            response.close()
+                            response = None
+                        if reconnects >= MAX_RECONNECTS:
+                            raise
+                        reconnects += 1
+                        # Back off so a CDN that keeps dropping connections doesn't burn every attempt at once
+                        delay = min(2 ** reconnects, 30)
+                        log(f"⚠️ Transfer interrupted at {downloaded / (1024 * 1024):.1f} MB ({e}), "
+                            f"reconnecting {reconnects}/{MAX_RECONNECTS} in {delay}s...")
+                        time.sleep(delay)
+
+                # content-length counts encoded bytes, so it can only be compared for identity transfers
+                encoded = response.headers.get('content-encoding', 'identity') != 'identity'
+                if total_size and not encoded and downloaded != total_size:
+                    log(f"❌ Incomplete download: {self.sink.describe(output_path)} "
+                        f"({downloaded} of {total_size} bytes)")
+                    return AssetResult(status='failed', path=output_path, bytes=downloaded,
+                                       elapsed=time.monotonic() - started, reconnects=reconnects,
+                                       error=f"incomplete: {downloaded} of {total_size} bytes")
+
+                # A failed transfer never reaches this point, so the previous copy and its sidecar stay
+                # consistent. Drop the old sidecar just before replacing the file, so an interruption
+                # between the two steps leaves an unverified file rather than a wrong checksum
+                self.sink.remove_metadata(output_path)
+                writer.commit()
+
+            self.sink.write_metadata(output_path, {
+                'url': file_url,
+                'source': self.url,
+                'size': downloaded,
+                'algorithm': hasher.name,
+                'checksum': hasher.hexdigest(),
+                'etag': response.headers.get('etag'),
+                'last_modified': response.headers.get('last-modified'),
+            })
+            if self.sync_report is not None:
+                self.sync_report.record('updated' if previous else 'added', output_path)
+
+            msg = f"✅ Finished: {self.sink.describe(output_path)}"
+            if reconnects:
+                msg += f" ({reconnects} reconnects)"
+            log(msg)
+            return AssetResult(status='downloaded', path=output_path, bytes=downloaded,
+                               elapsed=time.monotonic() - started, reconnects=reconnects)
+        except (requests.exceptions.RequestException, *self.sink.errors) as e:
+            log(f"❌ Error downloading file: {e}")
+            return AssetResult(status='failed', path=output_path, bytes=downloaded,
+                               elapsed=time.monotonic() - started, reconnects=reconnects, error=str(e))
+
+    def index_caption(self, path):
+        """Adds a downloaded caption file to the transcript search index."""
+        if not INDEX_TRANSCRIPTS or not isinstance(self.sink, LocalSink) or not path.lower().endswith('.vtt'):
+            return
+        try:
+            if transcript_index.index_caption(path):
+                print(f"   📚 Indexed {os.path.basename(path)}")
+        except (OSError, sqlite3.Error) as e:
+            print(f"   ⚠️ Could not index {os.path.basename(path)}: {e}")
 
     def get_file_extension(self, url):
         path = urlparse(url).path
         return os.path.splitext(path)[1]
 
     def run(self, download_high_quality=True, download_medium_quality=False, download_low_quality=False,
-            download_audio=True, download_captions=True, preferred_languages=None):
-        self._run_internal(
+            download_audio=True, download_captions=True, preferred_languages=None, max_workers=ASSET_WORKERS):
+        return self._run_internal(
             download_high_quality,
             download_medium_quality,
             download_low_quality,
             download_audio,
             download_captions,
             preferred_languages,
-            progress_callback=None
+            progress_callback=None,
+            max_workers=max_workers
         )
 
     def run_with_callback(self, download_high_quality=True, download_medium_quality=False, download_low_quality=False,
                           download_audio=True, download_captions=True, preferred_languages=None,
-                          progress_callback=None):
+                          progress_callback=None, max_workers=ASSET_WORKERS):
         # print("🔥 run_with_callback CALLED!")  # Keep this debug line
-        self._run_internal(
+        return self._run_internal(
             download_high_quality,
             download_medium_quality,
             download_low_quality,
             download_audio,
             download_captions,
             preferred_languages,
-            progress_callback
+            progress_callback,
+            max_workers
         )
 
+    def plan_tasks(self, title, public_video, wants_video, download_audio, download_captions, preferred_languages):
+        """
+        Breaks an entry into independent asset tasks: the video quality fallback chain,
+        the audio track and one task per preferred caption language.
+        """
+        tasks = []
+
+        if wants_video:
+            # Smart fallback: high -> medium -> low, only ONE video file per entry
+            chain = []
+            for quality, key in (('high', 'highQualityVideoUrl'), ('medium', 'mediumQualityVideoUrl'),
+                                 ('low', 'lowQualityVideoUrl')):
+                url = public_video.get(key)
+                if url:
+                    chain.append((quality, url, os.path.join(
+                        VIDEOS_DIR, f'{title}_{quality}_quality{self.get_file_extension(url)}')))
+            tasks.append(AssetTask('video', chain))
+
+        if download_audio:
+            audio_url = public_video.get('audioUrl')
+            candidates = []
+            if audio_url:
+                candidates.append(('audio', audio_url, os.path.join(
+                    AUDIOS_DIR, f'{title}_audio{self.get_file_extension(audio_url)}')))
+            tasks.append(AssetTask('audio', candidates))
+
+        if download_captions:
+            for caption in public_video.get('captions', []):
+                language = caption['language']
+                if preferred_languages is None or language in preferred_languages:
+                    url = caption['url']
+                    tasks.append(AssetTask('captions', [(language, url, os.path.join(
+                        SUBTITLES_DIR, f'{title}_{language}{self.get_file_extension(url)}'))],
+                        on_success=self.index_caption))
+                else:
+                    print(f"   ⏭️ Skipped {language} (not preferred)")
+
+        return tasks
+
     def _run_internal(self, download_high_quality, download_medium_quality, download_low_quality,
-                      download_audio, download_captions, preferred_languages, progress_callback):
+                      download_audio, download_captions, preferred_languages, progress_callback,
+                      max_workers=ASSET_WORKERS):
         def log(msg):
             if progress_callback:
                 progress_callback(msg)
             else:
                 print(msg)
 
+        started = time.monotonic()
         print("=" * 80)
         print(f"🚀 STARTING DOWNLOAD SESSION")
         print(f"🔗 URL: {self.url}")
         print("=" * 80)
 
-        entry_id, title = self.fetch_entry_id_and_title()
-        if not entry_id:
-            log("❌ Could not find entryId")
-            return
-
-        print(f"📝 Video title: {title}")
+        title, public_video, error = self.resolve()
+        if error:
+            log(error)
+            if self.sync_report is not None:
+                self.sync_report.record('failed', self.url)
+            return EntryResult(self.url, title, error=error, elapsed=time.monotonic() - started)
 
-        video_data = self.fetch_video_data(entry_id)
-        if not video_data:
-            log("❌ Failed to fetch video data")
-            return
-
-        if 'publicVideo' not in video_data:
-            log("❌ No video data in response")
-            return
-
-        public_video = video_data['publicVideo']
-        download_count = 0
-
-        # Analyze available content
-        high_url = public_video.get('highQualityVideoUrl')
-        medium_url = public_video.get('mediumQualityVideoUrl')
-        low_url = public_video.get('lowQualityVideoUrl')
-        audio_url = public_video.get('audioUrl')
-        captions = public_video.get('captions', [])
+        wants_video = download_high_quality or download_medium_quality or download_low_quality
 
         # Show what will be downloaded
         print("\n" + "─" * 60)
         print("📋 DOWNLOAD PLAN:")
         print("─" * 60)
-        print(f"🎬 Video: {'✅ YES' if download_high_quality else '❌ NO'}")
+        print(f"🎬 Video: {'✅ YES' if wants_video else '❌ NO'}")
         print(f"🎵 Audio: {'✅ YES' if download_audio else '❌ NO'}")
         print(f"📝 Captions: {'✅ YES' if download_captions else '❌ NO'}")
         if preferred_languages:
             print(f"🌐 Languages: {', '.join(preferred_languages)}")
         print("─" * 60)
 
-        # VIDEO PROCESSING with smart fallback
-        wants_video = download_high_quality or download_medium_quality or download_low_quality
-
-        if wants_video:
-            print("\n🎬 PROCESSING VIDEO CONTENT...")
-            print("📊 Quality analysis:")
-            print(f"   🔴 High: {'✅ Available' if high_url else '❌ Not available'}")
-            print(f"   🟡 Medium: {'✅ Available' if medium_url else '❌ Not available'}")
-            print(f"   🟢 Low: {'✅ Available' if low_url else '❌ Not available'}")
-
-            video_downloaded = False
-
-            # ATTEMPT 1: HIGH quality
-            if not video_downloaded and high_url:
-                print("\n📹 Downloading HIGH quality...")
-                try:
-                    self.download_file(high_url, os.path.join(VIDEOS_DIR,
-                                                              f'{title}_high_quality{self.get_file_extension(high_url)}'),
-                                       progress_callback)
-                    video_downloaded = True
-                    download_count += 1
-                    print("✅ HIGH quality downloaded successfully")
-                except Exception as e:
-                    print(f"❌ HIGH quality failed: {e}")
-
-            # ATTEMPT 2: MEDIUM quality (fallback)
-            if not video_downloaded and medium_url:
-                if high_url:
-                    print("\n🔄 Falling back to MEDIUM quality...")
-                else:
-                    print("\n📹 Downloading MEDIUM quality (best available)...")
-                try:
-                    self.download_file(medium_url, os.path.join(VIDEOS_DIR,
-                                                                f'{title}_medium_quality{self.get_file_extension(medium_url)}'),
-                                       progress_callback)
-                    video_downloaded = True
-                    download_count += 1
-                    print("✅ MEDIUM quality downloaded successfully")
-                except Exception as e:
-                    print(f"❌ MEDIUM quality failed: {e}")
-
-            # ATTEMPT 3: LOW quality (last fallback)
-            if not video_downloaded and low_url:
-                if high_url or medium_url:
-                    print("\n🔄 Falling back to LOW quality...")
-                else:
-                    print("\n📹 Downloading LOW quality (only available)...")
-                try:
-                    self.download_file(low_url, os.path.join(VIDEOS_DIR,
-                                                             f'{title}_low_quality{self.get_file_extension(low_url)}'),
-                                       progress_callback)
-                    video_downloaded = True
-                    download_count += 1
-                    print("✅ LOW quality downloaded successfully")
-                except Exception as e:
-                    print(f"❌ LOW quality failed: {e}")
-
-            # Video download summary
-            if not video_downloaded:
-                print("❌ No video could be downloaded")
-            else:
-                print("🎬 Video download completed")
-
-        # AUDIO PROCESSING
-        if download_audio:
-            print("\n🎵 PROCESSING AUDIO...")
-            if audio_url:
-                print("🎵 Downloading audio...")
-                try:
-                    self.download_file(audio_url,
-                                       os.path.join(AUDIOS_DIR, f'{title}_audio{self.get_file_extension(audio_url)}'),
-                                       progress_callback)
-                    download_count += 1
-                    print("✅ Audio downloaded successfully")
-                except Exception as e:
-                    print(f"❌ Audio failed: {e}")
-            else:
-                print("🔇 Audio not available")
-
-        # CAPTIONS PROCESSING
-        if download_captions:
-            print("\n📝 PROCESSING CAPTIONS...")
-            if captions:
-                caption_count = 0
-                preferred_str = ', '.join(preferred_languages) if preferred_languages else 'all'
-                print(f"📝 Downloading captions (preferred: {preferred_str})...")
-
-                for caption in captions:
-                    language = caption['language']
-                    if preferred_languages is None or language in preferred_languages:
-                        url = caption['url']
-                        print(f"   📥 Downloading {language} captions...")
-                        try:
-                            self.download_file(url, os.path.join(SUBTITLES_DIR,
-                                                                 f'{title}_{language}{self.get_file_extension(url)}'),
-                                               progress_callback)
-                            caption_count += 1
-                            print(f"   ✅ {language} captions downloaded")
-                        except Exception as e:
-                            print(f"   ❌ {language} captions failed: {e}")
-                    else:
-                        print(f"   ⏭️ Skipped {language} (not preferred)")
-
-                if caption_count > 0:
-                    download_count += caption_count
-                    print(f"📝 Captions completed: {caption_count} files")
-                else:
-                    print("📝 No captions downloaded")
-            else:
-                print("📝 No captions available")
-
-        # FINAL SUMMARY
-        print("\n" + "=" * 80)
-        print("🎉 DOWNLOAD SESSION COMPLETED")
-        print("=" * 80)
-
-        summary_parts = []
-        if wants_video and video_downloaded:
-            summary_parts.append("1 video")
-        if download_audio and audio_url:
-            summary_parts.append("1 audio")
-        if download_captions and captions:
-            downloaded_captions = len(
-                [c for c in captions if preferred_languages is None or c['language'] in preferred_languages])
-            if downloaded_captions > 0:
-                summary_parts.append(f"{downloaded_captions} captions")
-
-        if summary_parts:
-            print(f"🎉 Files downloaded: {', '.join(summary_parts)}")
-        else:
-            print("⚠️ No files downloaded")
-
-        print(f"📁 Files saved to: {os.path.dirname(VIDEOS_DIR)}")
-        print("=" * 80)
+        tasks = self.plan_tasks(title, public_video, wants_video, download_audio, download_captions,
+                                preferred_languages)
+        print(f"⚙️ Running {len(tasks)} asset tasks ({max_workers} at a time)")
+        assets = run_tasks(tasks,
+                           lambda url, path, position: self.download_file(url, path, progress_callback, position),
+                           max_workers, self.sync_report)
+
+        if self.sync_report is not None:
+            self.report_removed(title, public_video)
+
+        return EntryResult(self.url, title, assets=assets, elapsed=time.monotonic() - started)
+
+    def report_removed(self, title, public_video):
+        """
+        Records files downloaded for this entry by an earlier run whose asset URL is no
+        longer offered upstream. Nothing is deleted.
+        """
+        upstream_urls = {public_video.get(key) for key in
+                         ('highQualityVideoUrl', 'mediumQualityVideoUrl', 'lowQualityVideoUrl', 'audioUrl')}
+        upstream_urls.update(caption['url'] for caption in public_video.get('captions', []))
+
+        for directory in (VIDEOS_DIR, AUDIOS_DIR, SUBTITLES_DIR):
+            for path in self.sink.list_files(os.path.join(directory, f'{title}_')):
+                if self.sync_report.seen(path):
+                    continue
+                meta = self.sink.read_metadata(path)
+                if meta and meta.get('source') == self.url and meta.get('url') not in upstream_urls:
+                    self.sync_report.record('removed', path)
+
+
+def iter_prefetched(urls, lookahead=PREFETCH_LOOKAHEAD, **downloader_kwargs):
+    """
+    Yields a VideoDownloader for each URL, in order, with its metadata already resolved.
+    While the caller is downloading one entry, metadata for the next `lookahead` URLs
+    is resolved in the background, so the transfer stage never waits on page fetches.
+    With lookahead=0 the URLs are resolved one at a time, as before.
+    Extra keyword arguments (e.g. sink) are passed to each VideoDownloader.
+    """
+    downloaders = [VideoDownloader(url, **downloader_kwargs) for url in urls]
+    if lookahead <= 0:
+        yield from downloaders
+        return
+
+    with ThreadPoolExecutor(max_workers=lookahead) as executor:
+        futures = {}
+        for idx, downloader in enumerate(downloaders):
+            # Keep the window of in-flight resolutions filled up to idx + lookahead
+            for ahead in range(idx, min(idx + lookahead + 1, len(downloaders))):
+                if ahead not in futures:
+                    futures[ahead] = executor.submit(downloaders[ahead].resolve)
+            try:
+                futures.pop(idx).result()
+            except Exception as e:
+                # Let run() retry the resolution and report the error the usual way
+                print(f"⚠️ Prefetch failed for {downloader.url}: {e}")
+            yield downloader
 
 
 if __name__ == "__main__":
@@ -345,13 +567,13 @@ if __name__ == "__main__":
         "https://learn.microsoft.com/en-us/shows/on-demand-instructor-led-training-series/ai-050-module-4/",
     ]
     preferred_languages = ['en-us', 'ru-ru']
-    for url in urls:
-        downloader = VideoDownloader(url)
-        downloader.run(
+    for downloader in iter_prefetched(urls):
+        result = downloader.run(
             download_high_quality=True,
             download_medium_quality=False,
             download_low_quality=False,
             download_audio=True,
             download_captions=True,
             preferred_languages=preferred_languages
-        )
\ No newline at end of file
+        )
+        print(result.summary())
\ No newline at end of file
@@ -0,0 +1,281 @@
+import glob
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+from config import (BASE_DOWNLOAD_DIR, OUTPUT_SINK, S3_BUCKET, S3_PREFIX, S3_ENDPOINT_URL,
+                    S3_PART_SIZE, S3_MAX_PENDING_PARTS)
+from integrity import (SIDECAR_SUFFIX, PART_SUFFIX, is_sidecar, is_temporary, read_sidecar, write_sidecar,
+                       remove_sidecar)
+
+try:
+    import boto3
+    from botocore.exceptions import BotoCoreError
+except ImportError:
+    boto3 = None
+    BotoCoreError = None
+
+# S3 rejects multipart parts smaller than this (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class SinkWriter:
+    """
+    Receives the bytes of one download as they arrive.
+    Used as a context manager: anything not explicitly committed is aborted on exit.
+    """
+
+    def __init__(self):
+        self.committed = False
+
+    def write(self, chunk):
+        raise NotImplementedError
+
+    def restart(self):
+        """Discards everything written so far (the server could not resume a transfer)."""
+        raise NotImplementedError
+
+    def commit(self):
+        self.committed = True
+
+    def abort(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.committed:
+            self.abort()
+
+
+class LocalWriter(SinkWriter):
+    """
+    Writes to <path>.part and renames it onto `path` on commit, so a failed or
+    incomplete download never touches an existing complete copy.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.temp_path = path + PART_SUFFIX
+        self._file = open(self.temp_path, 'wb')
+
+    def write(self, chunk):
+        self._file.write(chunk)
+
+    def restart(self):
+        self._file.seek(0)
+        self._file.truncate()
+
+    def commit(self):
+        self._file.close()
+        os.replace(self.temp_path, self.path)
+        super().commit()
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+class LocalSink:
+    """Writes downloads to their paths on the local filesystem."""
+
+    # Exceptions a failed write can raise, reported as a failed download
+    errors = (OSError,)
+
+    def open(self, path):
+        return LocalWriter(path)
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def size(self, path):
+        return os.path.getsize(path)
+
+    def list_files(self, prefix):
+        """Returns the downloaded files whose path starts with `prefix`."""
+        return sorted(path for path in glob.glob(glob.escape(prefix) + '*')
+                      if not is_sidecar(path) and not is_temporary(path))
+
+    def describe(self, path):
+        return path
+
+    def read_metadata(self, path):
+        return read_sidecar(path)
+
+    def write_metadata(self, path, meta):
+        write_sidecar(path, meta)
+
+    def remove_metadata(self, path):
+        remove_sidecar(path)
+
+
+class S3Writer(SinkWriter):
+    """
+    Streams a download into a multipart upload while it is still arriving.
+    At most S3_MAX_PENDING_PARTS parts are uploading in the background, so memory
+    use stays bounded to roughly (pending parts + 1) * part size per transfer.
+    Files smaller than one part are sent with a single PUT on commit.
+    """
+
+    def __init__(self, client, bucket, key, part_size, max_pending):
+        super().__init__()
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.max_pending = max(max_pending, 1)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_pending)
+        self._reset()
+
+    def _reset(self):
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._futures = []
+
+    def write(self, chunk):
+        self._buffer += chunk
+        if len(self._buffer) >= self.part_size:
+            self._flush_part()
+
+    def _flush_part(self):
+        if self._upload_id is None:
+            response = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.key)
+            self._upload_id = response['UploadId']
+
+        # Backpressure: wait for an upload slot before buffering more
+        pending = [f for f in self._futures if not f.done()]
+        while len(pending) >= self.max_pending:
+            wait(pending, return_when=FIRST_COMPLETED)
+            pending = [f for f in pending if not f.done()]
+
+        # Fail the transfer as soon as a part upload fails, not after the whole file arrived
+        for future in self._futures:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+        part_number = len(self._futures) + 1
+        body = bytes(self._buffer)
+        self._buffer = bytearray()
+        self._futures.append(self._executor.submit(self._upload_part, self._upload_id, part_number, body))
+
+    def _upload_part(self, upload_id, part_number, body):
+        response = self.client.upload_part(Bucket=self.bucket, Key=self.key, UploadId=upload_id,
+                                           PartNumber=part_number, Body=body)
+        return {'PartNumber': part_number, 'ETag': response['ETag']}
+
+    def restart(self):
+        self.abort()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_pending)
+        self._reset()
+
+    def commit(self):
+        try:
+            if self._upload_id is None:
+                self.client.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer))
+            else:
+                if self._buffer:
+                    self._flush_part()
+                parts = [future.result() for future in self._futures]
+                self.client.complete_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+                                                      MultipartUpload={'Parts': parts})
+        finally:
+            self._executor.shutdown()
+        super().commit()
+
+    def abort(self):
+        self._executor.shutdown(cancel_futures=True)
+        if self._upload_id is not None:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+            self._upload_id = None
+
+
+class S3Sink:
+    """
+    Streams downloads to an S3-compatible bucket (AWS, MinIO, ...) without staging them on disk.
+    Local paths under `root` map to object keys under `prefix`, so the bucket mirrors
+    the videos/audios/subtitles layout. Credentials come from the usual AWS environment.
+    """
+
+    def __init__(self, bucket, prefix='', endpoint_url=None, root=BASE_DOWNLOAD_DIR,
+                 part_size=S3_PART_SIZE, max_pending=S3_MAX_PENDING_PARTS, client=None):
+        if client is None:
+            if boto3 is None:
+                raise RuntimeError("S3 output requires boto3: pip install boto3")
+            client = boto3.client('s3', endpoint_url=endpoint_url or None)
+        if not bucket:
+            raise ValueError("S3 output requires a bucket name (S3_BUCKET)")
+        self.client = client
+        # Exceptions a failed upload can raise, reported as a failed download
+        self.errors = (OSError, client.exceptions.ClientError) + ((BotoCoreError,) if BotoCoreError else ())
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.root = root
+        self.part_size = part_size
+        self.max_pending = max_pending
+
+    def key_for(self, path):
+        relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+        if relative == '.':
+            return self.prefix
+        return f"{self.prefix}/{relative}" if self.prefix else relative
+
+    def path_for(self, key):
+        relative = key[len(self.prefix) + 1:] if self.prefix else key
+        return os.path.join(self.root, *relative.split('/'))
+
+    def open(self, path):
+        return S3Writer(self.client, self.bucket, self.key_for(path), self.part_size, self.max_pending)
+
+    def exists(self, path):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.key_for(path))
+            return True
+        except self.client.exceptions.ClientError:
+            return False
+
+    def list_files(self, prefix):
+        """Returns the downloaded files whose path starts with `prefix`."""
+        paths = []
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.key_for(prefix)):
+            for obj in page.get('Contents', []):
+                if not is_sidecar(obj['Key']):
+                    paths.append(self.path_for(obj['Key']))
+        return sorted(paths)
+
+    def size(self, path):
+        return self.client.head_object(Bucket=self.bucket, Key=self.key_for(path))['ContentLength']
+
+    def describe(self, path):
+        return f"s3://{self.bucket}/{self.key_for(path)}"
+
+    def read_metadata(self, path):
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.key_for(path) + SIDECAR_SUFFIX)
+            return json.loads(response['Body'].read())
+        except (self.client.exceptions.ClientError, ValueError):
+            return None
+
+    def write_metadata(self, path, meta):
+        self.client.put_object(Bucket=self.bucket, Key=self.key_for(path) + SIDECAR_SUFFIX,
+                               Body=json.dumps(meta, indent=2).encode('utf-8'),
+                               ContentType='application/json')
+
+    def remove_metadata(self, path):
+        self.client.delete_object(Bucket=self.bucket, Key=self.key_for(path) + SIDECAR_SUFFIX)
+
+
+@lru_cache(maxsize=None)
+def default_sink():
+    """Returns the sink selected by OUTPUT_SINK, shared by all downloaders."""
+    if OUTPUT_SINK == 'local':
+        return LocalSink()
+    if OUTPUT_SINK == 's3':
+        return S3Sink(S3_BUCKET, S3_PREFIX, S3_ENDPOINT_URL)
+    raise ValueError(f"Unknown OUTPUT_SINK: {OUTPUT_SINK!r} (expected 'local' or 's3')")
@@ -0,0 +1,60 @@
+import threading
+from config import PREFETCH_LOOKAHEAD
+from learn_video_helper import iter_prefetched
+
+
+class SyncReport:
+    """
+    Collects what a sync run did to each asset:
+    added (new upstream), updated (changed upstream), unchanged (validated with a 304 / matching size),
+    removed (downloaded before but no longer offered upstream; never deleted) and failed.
+    """
+    STATUSES = ('added', 'updated', 'unchanged', 'removed', 'failed')
+    ICONS = {'added': '🆕', 'updated': '🔄', 'unchanged': '✔️', 'removed': '🗑️', 'failed': '❌'}
+
+    def __init__(self):
+        self.items = {status: [] for status in self.STATUSES}
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def record(self, status, path):
+        with self._lock:
+            self.items[status].append(path)
+            self._seen.add(path)
+
+    def seen(self, path):
+        with self._lock:
+            return path in self._seen
+
+    def summary(self, details=True):
+        lines = ["📊 SYNC REPORT: " + ", ".join(f"{len(self.items[s])} {s}" for s in self.STATUSES)]
+        if details:
+            for status in self.STATUSES:
+                if status == 'unchanged':
+                    continue
+                for path in self.items[status]:
+                    lines.append(f"   {self.ICONS[status]} {status}: {path}")
+        return "\n".join(lines)
+
+
+def sync_links(links, preferred_languages=None, lookahead=PREFETCH_LOOKAHEAD, sink=None,
+               download_video=True, download_audio=True, download_captions=True):
+    """
+    Brings an existing download tree up to date with `links`: unchanged assets are only
+    revalidated with conditional requests, new or changed ones are downloaded.
+    Returns the SyncReport.
+    """
+    report = SyncReport()
+    for downloader in iter_prefetched(links, lookahead, sink=sink, sync_report=report):
+        print(f"Syncing link: {downloader.url}")
+        result = downloader.run(
+            download_high_quality=download_video,
+            download_medium_quality=False,
+            download_low_quality=False,
+            download_audio=download_audio,
+            download_captions=download_captions,
+            preferred_languages=preferred_languages
+        )
+        print(result.summary())
+    print(report.summary())
+    return report
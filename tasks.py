@@ -0,0 +1,114 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+
+@dataclass
+class AssetResult:
+    """Outcome of one asset (a video, the audio track or one caption language)."""
+    kind: str = ''            # 'video', 'audio' or 'captions'
+    name: str = ''            # chosen quality for video, language for captions
+    status: str = 'failed'    # 'downloaded', 'unchanged', 'failed' or 'unavailable'
+    path: Optional[str] = None
+    bytes: int = 0
+    elapsed: float = 0.0      # seconds, including failed fallback attempts
+    reconnects: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.status in ('downloaded', 'unchanged')
+
+    def __bool__(self):
+        return self.ok
+
+
+@dataclass
+class EntryResult:
+    """Outcome of one Microsoft Learn URL: metadata resolution plus every asset task."""
+    url: str
+    title: Optional[str] = None
+    error: Optional[str] = None
+    assets: List[AssetResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None and all(asset.ok or asset.status == 'unavailable' for asset in self.assets)
+
+    @property
+    def bytes(self):
+        return sum(asset.bytes for asset in self.assets)
+
+    def summary(self):
+        if self.error:
+            return f"❌ {self.url}: {self.error}"
+        icons = {'downloaded': '✅', 'unchanged': '✔️', 'failed': '❌', 'unavailable': '🚫'}
+        lines = [f"🎉 {self.title}: {self.bytes / (1024 * 1024):.1f} MB in {self.elapsed:.1f}s"]
+        for asset in self.assets:
+            line = (f"   {icons[asset.status]} {asset.kind} ({asset.name}): {asset.status}, "
+                    f"{asset.bytes / (1024 * 1024):.1f} MB in {asset.elapsed:.1f}s")
+            if asset.reconnects:
+                line += f", {asset.reconnects} reconnects"
+            if asset.error:
+                line += f" ({asset.error})"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+@dataclass
+class AssetTask:
+    """
+    One independent unit of work within an entry. Candidates are (name, url, path)
+    tried in order until one succeeds, which is how the video quality fallback works;
+    audio and each caption language have a single candidate.
+    """
+    kind: str
+    candidates: List[Tuple[str, str, str]]
+    on_success: Optional[Callable[[str], None]] = None
+
+
+def run_task(task, download, sync_report=None, position=None):
+    """
+    Runs `task` using `download(url, path, position) -> AssetResult`, falling back through its
+    candidates. `position` is the progress bar line reserved for this task.
+    Reconnects are summed over all attempts. Only the final outcome is recorded as failed in
+    `sync_report`, so a quality that fails before a fallback succeeds is not reported.
+    """
+    started = time.monotonic()
+    if not task.candidates:
+        return AssetResult(kind=task.kind, name=task.kind, status='unavailable')
+
+    result = None
+    reconnects = 0
+    for index, (name, url, path) in enumerate(task.candidates):
+        if index:
+            print(f"🔄 {task.kind}: falling back to {name.upper()}...")
+        try:
+            result = download(url, path, position)
+        except Exception as e:
+            result = AssetResult(status='failed', path=path, error=str(e))
+        result.kind = task.kind
+        result.name = name
+        reconnects += result.reconnects
+        if result:
+            break
+
+    result.elapsed = time.monotonic() - started
+    result.reconnects = reconnects
+    if result and task.on_success:
+        task.on_success(result.path)
+    if not result and sync_report is not None:
+        sync_report.record('failed', result.path)
+    return result
+
+
+def run_tasks(tasks, download, max_workers, sync_report=None):
+    """Runs independent asset tasks concurrently and returns their results in task order."""
+    if not tasks:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as executor:
+        # Each task keeps its own progress bar line so concurrent bars don't overwrite each other
+        return list(executor.map(lambda task, position: run_task(task, download, sync_report, position),
+                                 tasks, range(len(tasks))))
@@ -0,0 +1,18 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# config.py creates the download directories on import; keep them out of the working tree
+os.environ.setdefault('DOWNLOAD_DIR', tempfile.mkdtemp(prefix='learn-downloads-'))
+
+
+@pytest.fixture
+def http_server():
+    from standins import LocalHTTPServer
+    with LocalHTTPServer() as server:
+        yield server
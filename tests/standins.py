@@ -0,0 +1,200 @@
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from sinks import MIN_PART_SIZE
+
+
+class Asset:
+    """A file served by LocalHTTPServer, with knobs for the failure modes the downloader handles."""
+
+    def __init__(self, body, etag=None, last_modified=None, supports_range=True, honour_conditional=True,
+                 drop_after=None, drops=1, next_version=None, bad_range=False, trickle=None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.supports_range = supports_range
+        self.honour_conditional = honour_conditional
+        self.drop_after = drop_after      # bytes sent before the connection is cut
+        self.drops = drops                # how many responses are cut
+        self.next_version = next_version  # (body, etag) the asset changes to after a drop
+        self.bad_range = bad_range        # answer ranged requests with the wrong range
+        self.trickle = trickle            # bytes per second
+
+
+class LocalHTTPServer:
+    """
+    Serves Asset objects from a background thread on 127.0.0.1. Supports HEAD,
+    If-None-Match / If-Modified-Since (304), Range with If-Range, and records every request.
+    """
+
+    def __init__(self):
+        self.assets = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_HEAD(self):
+                self.respond(send_body=False)
+
+            def do_GET(self):
+                self.respond(send_body=True)
+
+            def respond(self, send_body):
+                server.requests.append((self.command, self.path, dict(self.headers)))
+                asset = server.assets.get(self.path)
+                if asset is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                if asset.honour_conditional and (
+                        (asset.etag and self.headers.get('If-None-Match') == asset.etag) or
+                        (asset.last_modified and self.headers.get('If-Modified-Since') == asset.last_modified)):
+                    self.send_response(304)
+                    self.send_common_headers(asset)
+                    self.end_headers()
+                    return
+
+                body, status, start = asset.body, 200, 0
+                range_match = re.match(r'bytes=(\d+)-', self.headers.get('Range', ''))
+                if_range = self.headers.get('If-Range')
+                if range_match and asset.supports_range and if_range in (None, asset.etag, asset.last_modified):
+                    start = 0 if asset.bad_range else int(range_match.group(1))
+                    body, status = asset.body[start:], 206
+
+                self.send_response(status)
+                self.send_common_headers(asset)
+                self.send_header('Content-Length', str(len(body)))
+                if status == 206:
+                    self.send_header('Content-Range', f'bytes {start}-{len(asset.body) - 1}/{len(asset.body)}')
+                self.end_headers()
+                if send_body:
+                    self.send_body(asset, body)
+
+            def send_common_headers(self, asset):
+                if asset.etag:
+                    self.send_header('ETag', asset.etag)
+                if asset.last_modified:
+                    self.send_header('Last-Modified', asset.last_modified)
+
+            def send_body(self, asset, body):
+                try:
+                    if asset.drop_after is not None and asset.drops > 0:
+                        asset.drops -= 1
+                        self.wfile.write(body[:asset.drop_after])
+                        self.wfile.flush()
+                        if asset.next_version:
+                            asset.body, asset.etag = asset.next_version
+                        self.close_connection = True
+                    elif asset.trickle:
+                        step = max(1, asset.trickle // 10)
+                        for offset in range(0, len(body), step):
+                            self.wfile.write(body[offset:offset + step])
+                            self.wfile.flush()
+                            time.sleep(0.1)
+                    else:
+                        self.wfile.write(body)
+                except OSError:
+                    self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self._server.server_port}{path}"
+
+    def requests_for(self, path, method='GET'):
+        return [headers for command, request_path, headers in self.requests
+                if command == method and request_path == path]
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class ClientError(Exception):
+    pass
+
+
+class InMemoryS3:
+    """
+    Minimal S3-compatible stand-in (the subset of the boto3 client used by S3Sink).
+    Like S3/MinIO it rejects non-final multipart parts under 5 MiB. It also records the
+    peak number of parts uploading at once, and can fail a given part number or every PUT.
+    """
+
+    def __init__(self, part_delay=0.0, fail_part=None, fail_put=False):
+        self.exceptions = SimpleNamespace(ClientError=ClientError)
+        self.objects = {}
+        self.uploads = {}
+        self.aborted = []
+        self.part_delay = part_delay
+        self.fail_part = fail_part
+        self.fail_put = fail_put
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {'key': (Bucket, Key), 'parts': {}}
+        return {'UploadId': upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            time.sleep(self.part_delay)
+            if PartNumber == self.fail_part:
+                raise ClientError(f"part {PartNumber} failed")
+            self.uploads[UploadId]['parts'][PartNumber] = Body
+            return {'ETag': f'"etag-{PartNumber}"'}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads.pop(UploadId)
+        numbers = [part['PartNumber'] for part in MultipartUpload['Parts']]
+        assert numbers == sorted(numbers)
+        bodies = [upload['parts'][number] for number in numbers]
+        if any(len(body) < MIN_PART_SIZE for body in bodies[:-1]):
+            raise ClientError("EntityTooSmall")
+        self.objects[(Bucket, Key)] = b''.join(bodies)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+        self.aborted.append(UploadId)
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        if self.fail_put:
+            raise ClientError("put_object failed")
+        self.objects[(Bucket, Key)] = bytes(Body)
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise ClientError("404")
+        return {'ContentLength': len(self.objects[(Bucket, Key)])}
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise ClientError("NoSuchKey")
+        body = self.objects[(Bucket, Key)]
+        return {'Body': SimpleNamespace(read=lambda: body)}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
@@ -0,0 +1,145 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import learn_video_helper
+from learn_video_helper import VideoDownloader, if_range_headers, resumes_at
+from integrity import read_sidecar, verify_file
+from sinks import LocalSink, S3Sink
+from standins import Asset, InMemoryS3
+
+BODY = bytes(range(256)) * 400
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Records reconnect backoff delays instead of waiting for them."""
+    delays = []
+    monkeypatch.setattr(learn_video_helper, 'time', SimpleNamespace(monotonic=time.monotonic, sleep=delays.append))
+    return delays
+
+
+def download(http_server, tmp_path, path='/video.mp4'):
+    output_path = os.path.join(str(tmp_path), 'videos', 'video.mp4')
+    result = VideoDownloader('https://learn.example/page', sink=LocalSink()).download_file(
+        http_server.url(path), output_path)
+    return result, output_path
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_complete_download_writes_checksum_sidecar(http_server, tmp_path):
+    http_server.assets['/video.mp4'] = Asset(BODY, etag='"v1"')
+
+    result, path = download(http_server, tmp_path)
+
+    assert result.status == 'downloaded' and result.bytes == len(BODY)
+    assert read(path) == BODY
+    assert read_sidecar(path)['etag'] == '"v1"'
+    assert verify_file(path)[1] == 'ok'
+
+
+def test_dropped_connection_resumes_with_if_range(http_server, tmp_path, sleeps):
+    http_server.assets['/video.mp4'] = Asset(BODY, etag='"v1"', drop_after=30000)
+
+    result, path = download(http_server, tmp_path)
+
+    assert result.status == 'downloaded' and result.reconnects == 1
+    assert read(path) == BODY
+    resumed = http_server.requests_for('/video.mp4')[1]
+    assert resumed['Range'].startswith('bytes=') and resumed['If-Range'] == '"v1"'
+    assert sleeps == [2]
+
+
+def test_asset_changed_between_connections_restarts(http_server, tmp_path, sleeps):
+    new_body = b're-encoded' * 5000
+    http_server.assets['/video.mp4'] = Asset(BODY, etag='"v1"', drop_after=30000,
+                                             next_version=(new_body, '"v2"'))
+
+    result, path = download(http_server, tmp_path)
+
+    assert result.status == 'downloaded'
+    assert read(path) == new_body
+    assert read_sidecar(path)['etag'] == '"v2"'
+    assert verify_file(path)[1] == 'ok'
+
+
+def test_wrong_range_restarts_instead_of_splicing(http_server, tmp_path, sleeps):
+    http_server.assets['/video.mp4'] = Asset(BODY, etag='"v1"', drop_after=30000, bad_range=True)
+
+    result, path = download(http_server, tmp_path)
+
+    assert result.status == 'downloaded'
+    assert read(path) == BODY
+
+
+def test_server_without_range_support_restarts(http_server, tmp_path, sleeps):
+    http_server.assets['/video.mp4'] = Asset(BODY, drop_after=30000, supports_range=False)
+
+    result, path = download(http_server, tmp_path)
+
+    assert result.status == 'downloaded'
+    assert read(path) == BODY
+
+
+def test_reconnects_back_off_and_give_up(http_server, tmp_path, sleeps, monkeypatch):
+    monkeypatch.setattr(learn_video_helper, 'MAX_RECONNECTS', 3)
+    http_server.assets['/video.mp4'] = Asset(BODY, etag='"v1"', drop_after=20000, drops=10)
+
+    result, path = download(http_server, tmp_path)
+
+    assert result.status == 'failed'
+    # Each of the 4 connections delivers whole chunks before it is cut
+    assert result.reconnects == 3 and 0 < result.bytes < len(BODY)
+    assert sleeps == [2, 4, 8]
+    assert not os.path.exists(path) and not os.path.exists(path + '.part')
+
+
+def test_trickle_is_detected_within_the_stall_window(http_server, tmp_path, sleeps, monkeypatch):
+    monkeypatch.setattr(learn_video_helper, 'STALL_WINDOW', 1.0)
+    monkeypatch.setattr(learn_video_helper, 'MIN_THROUGHPUT', 32 * 1024)
+    monkeypatch.setattr(learn_video_helper, 'MAX_RECONNECTS', 0)
+    http_server.assets['/video.mp4'] = Asset(BODY, trickle=250)
+
+    started = time.monotonic()
+    result, path = download(http_server, tmp_path)
+
+    assert result.status == 'failed' and 'throughput' in result.error
+    assert time.monotonic() - started < 5
+
+
+def test_resumes_at_checks_content_range():
+    def partial(content_range, status=206):
+        return SimpleNamespace(status_code=status, headers={'content-range': content_range})
+
+    assert resumes_at(partial('bytes 100-999/1000'), 100, 1000)
+    assert resumes_at(partial('bytes 100-999/*'), 100, 1000)
+    assert not resumes_at(partial('bytes 0-999/1000'), 100, 1000)
+    assert not resumes_at(partial('bytes 100-1999/2000'), 100, 1000)
+    assert not resumes_at(partial(''), 100, 1000)
+    assert not resumes_at(partial('bytes 100-999/1000', status=200), 100, 1000)
+
+
+def test_if_range_prefers_strong_etag():
+    assert if_range_headers({'etag': '"a"', 'last-modified': 'Mon'}) == {'If-Range': '"a"'}
+    assert if_range_headers({'etag': 'W/"a"', 'last-modified': 'Mon'}) == {'If-Range': 'Mon'}
+    assert if_range_headers({'etag': 'W/"a"'}) == {}
+    assert if_range_headers({}) == {}
+
+
+def test_sink_failure_is_a_failed_result_with_metrics(http_server, tmp_path):
+    http_server.assets['/captions.vtt'] = Asset(b'WEBVTT\n' * 100)
+    sink = S3Sink('archive', root=str(tmp_path), client=InMemoryS3(fail_put=True))
+    messages = []
+
+    result = VideoDownloader('https://learn.example/page', sink=sink).download_file(
+        http_server.url('/captions.vtt'), os.path.join(str(tmp_path), 'subtitles', 'x_en-us.vtt'), messages.append)
+
+    assert result.status == 'failed' and 'put_object failed' in result.error
+    assert result.bytes == 700 and result.elapsed > 0
+    assert any(message.startswith("❌ Error downloading file") for message in messages)
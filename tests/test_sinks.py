@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from sinks import LocalSink, S3Sink, MIN_PART_SIZE
+from standins import ClientError, InMemoryS3
+
+
+def stream(writer, data, chunk_size=8192):
+    for offset in range(0, len(data), chunk_size):
+        writer.write(data[offset:offset + chunk_size])
+
+
+def test_s3_multipart_upload_reassembles_in_order(tmp_path):
+    client = InMemoryS3(part_delay=0.01)
+    sink = S3Sink('archive', 'learn', root=str(tmp_path), part_size=MIN_PART_SIZE, max_pending=2, client=client)
+    data = os.urandom(3 * MIN_PART_SIZE + 12345)
+    path = os.path.join(str(tmp_path), 'videos', 'Module 1_high_quality.mp4')
+
+    with sink.open(path) as writer:
+        stream(writer, data)
+        writer.commit()
+
+    assert client.objects[('archive', 'learn/videos/Module 1_high_quality.mp4')] == data
+    assert not client.uploads
+
+
+def test_s3_upload_keeps_bounded_parts_in_flight(tmp_path):
+    client = InMemoryS3(part_delay=0.05)
+    sink = S3Sink('archive', root=str(tmp_path), part_size=MIN_PART_SIZE, max_pending=2, client=client)
+
+    with sink.open(os.path.join(str(tmp_path), 'videos', 'big.mp4')) as writer:
+        stream(writer, os.urandom(6 * MIN_PART_SIZE))
+        writer.commit()
+
+    assert client.peak_in_flight == 2
+
+
+def test_s3_small_file_uses_single_put(tmp_path):
+    client = InMemoryS3()
+    sink = S3Sink('archive', root=str(tmp_path), client=client)
+
+    with sink.open(os.path.join(str(tmp_path), 'subtitles', 'Module 1_en-us.vtt')) as writer:
+        writer.write(b'WEBVTT\n')
+        writer.commit()
+
+    assert client.objects[('archive', 'subtitles/Module 1_en-us.vtt')] == b'WEBVTT\n'
+    assert not client.uploads
+
+
+def test_s3_uncommitted_upload_is_aborted(tmp_path):
+    client = InMemoryS3()
+    sink = S3Sink('archive', root=str(tmp_path), part_size=MIN_PART_SIZE, client=client)
+
+    with sink.open(os.path.join(str(tmp_path), 'videos', 'cut.mp4')) as writer:
+        stream(writer, os.urandom(2 * MIN_PART_SIZE))
+
+    assert client.aborted and not client.uploads
+    assert not client.objects
+
+
+def test_s3_failed_part_raises_before_transfer_ends(tmp_path):
+    client = InMemoryS3(fail_part=1)
+    sink = S3Sink('archive', root=str(tmp_path), part_size=MIN_PART_SIZE, max_pending=1, client=client)
+    data = os.urandom(10 * MIN_PART_SIZE)
+    written = 0
+
+    with pytest.raises(ClientError):
+        with sink.open(os.path.join(str(tmp_path), 'videos', 'broken.mp4')) as writer:
+            for offset in range(0, len(data), 8192):
+                writer.write(data[offset:offset + 8192])
+                written += 8192
+
+    assert written < len(data) // 2
+    assert client.aborted and not client.objects
+
+
+def test_s3_metadata_round_trip(tmp_path):
+    client = InMemoryS3()
+    sink = S3Sink('archive', 'learn', root=str(tmp_path), client=client)
+    path = os.path.join(str(tmp_path), 'audios', 'Module 1_audio.mp4')
+
+    assert sink.read_metadata(path) is None
+    sink.write_metadata(path, {'size': 3, 'checksum': 'abc'})
+    assert sink.read_metadata(path) == {'size': 3, 'checksum': 'abc'}
+    sink.remove_metadata(path)
+    assert sink.read_metadata(path) is None
+
+
+def test_local_commit_replaces_target(tmp_path):
+    path = os.path.join(str(tmp_path), 'videos', 'a.mp4')
+
+    with LocalSink().open(path) as writer:
+        writer.write(b'new content')
+        assert not os.path.exists(path)
+        writer.commit()
+
+    with open(path, 'rb') as f:
+        assert f.read() == b'new content'
+    assert os.listdir(os.path.dirname(path)) == ['a.mp4']
+
+
+def test_local_abort_keeps_previous_copy(tmp_path):
+    path = os.path.join(str(tmp_path), 'videos', 'a.mp4')
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'wb') as f:
+        f.write(b'complete old copy')
+
+    with LocalSink().open(path) as writer:
+        writer.write(b'partial')
+
+    with open(path, 'rb') as f:
+        assert f.read() == b'complete old copy'
+    assert LocalSink().list_files(os.path.join(str(tmp_path), 'videos', '')) == [path]
+    assert os.listdir(os.path.dirname(path)) == ['a.mp4']
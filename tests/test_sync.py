@@ -0,0 +1,113 @@
+import os
+
+import requests
+
+import learn_video_helper
+from config import VIDEOS_DIR, SUBTITLES_DIR
+from sinks import LocalSink
+from standins import Asset
+from sync import sync_links
+
+
+def test_unreachable_pages_are_reported_and_the_batch_continues(monkeypatch, capsys):
+    def timeout(*args, **kwargs):
+        raise requests.exceptions.ReadTimeout("read timed out")
+    monkeypatch.setattr(learn_video_helper.requests, 'get', timeout)
+
+    report = sync_links(['https://learn.example/one', 'https://learn.example/two'], lookahead=1, sink=LocalSink())
+
+    assert report.items['failed'] == ['https://learn.example/one', 'https://learn.example/two']
+    assert 'SYNC REPORT' in capsys.readouterr().out
+
+
+PAGE = 'https://learn.example/shows/module-1'
+
+
+def sync_entry(monkeypatch, title, public_video, languages=None):
+    monkeypatch.setattr(learn_video_helper.VideoDownloader, '_fetch_metadata',
+                        lambda self: (title, public_video, None))
+    return sync_links([PAGE], languages, lookahead=0, sink=LocalSink())
+
+
+def video_path(title, quality='high'):
+    return os.path.join(VIDEOS_DIR, f'{title}_{quality}_quality.mp4')
+
+
+def test_unchanged_asset_costs_a_304(http_server, monkeypatch):
+    http_server.assets['/v.mp4'] = Asset(b'video' * 1000, etag='"v1"')
+    public_video = {'highQualityVideoUrl': http_server.url('/v.mp4')}
+
+    first = sync_entry(monkeypatch, 'Cond', public_video)
+    second = sync_entry(monkeypatch, 'Cond', public_video)
+
+    assert first.items['added'] == [video_path('Cond')]
+    assert second.items['unchanged'] == [video_path('Cond')]
+    assert http_server.requests_for('/v.mp4')[-1]['If-None-Match'] == '"v1"'
+
+
+def test_same_etag_without_304_is_unchanged(http_server, monkeypatch):
+    http_server.assets['/v.mp4'] = Asset(b'video' * 1000, etag='"v1"', honour_conditional=False)
+    public_video = {'highQualityVideoUrl': http_server.url('/v.mp4')}
+
+    sync_entry(monkeypatch, 'SameEtag', public_video)
+    report = sync_entry(monkeypatch, 'SameEtag', public_video)
+
+    assert report.items['unchanged'] == [video_path('SameEtag')]
+
+
+def test_changed_asset_is_updated(http_server, monkeypatch):
+    http_server.assets['/v.mp4'] = Asset(b'video' * 1000, etag='"v1"')
+    public_video = {'highQualityVideoUrl': http_server.url('/v.mp4')}
+
+    sync_entry(monkeypatch, 'Changed', public_video)
+    http_server.assets['/v.mp4'] = Asset(b're-encoded' * 1000, etag='"v2"')
+    report = sync_entry(monkeypatch, 'Changed', public_video)
+
+    assert report.items['updated'] == [video_path('Changed')]
+    with open(video_path('Changed'), 'rb') as f:
+        assert f.read() == b're-encoded' * 1000
+
+
+def test_files_without_sidecar_are_checked_by_size(http_server, monkeypatch):
+    body = b'legacy' * 1000
+    http_server.assets['/same.mp4'] = Asset(body)
+    http_server.assets['/grown.mp4'] = Asset(body + b'more')
+    for title in ('LegacySame', 'LegacyGrown'):
+        os.makedirs(VIDEOS_DIR, exist_ok=True)
+        with open(video_path(title), 'wb') as f:
+            f.write(body)
+
+    same = sync_entry(monkeypatch, 'LegacySame', {'highQualityVideoUrl': http_server.url('/same.mp4')})
+    grown = sync_entry(monkeypatch, 'LegacyGrown', {'highQualityVideoUrl': http_server.url('/grown.mp4')})
+
+    assert same.items['unchanged'] == [video_path('LegacySame')]
+    assert not http_server.requests_for('/same.mp4')
+    assert http_server.requests_for('/same.mp4', method='HEAD')
+    assert grown.items['updated'] == [video_path('LegacyGrown')]
+
+
+def test_captions_dropped_upstream_are_reported_removed(http_server, monkeypatch):
+    http_server.assets['/en.vtt'] = Asset(b'WEBVTT\n', etag='"en"')
+    http_server.assets['/ru.vtt'] = Asset(b'WEBVTT\n', etag='"ru"')
+    captions = [{'language': 'en-us', 'url': http_server.url('/en.vtt')},
+                {'language': 'ru-ru', 'url': http_server.url('/ru.vtt')}]
+
+    sync_entry(monkeypatch, 'Removed', {'captions': captions})
+    report = sync_entry(monkeypatch, 'Removed', {'captions': captions[:1]})
+
+    removed = os.path.join(SUBTITLES_DIR, 'Removed_ru-ru.vtt')
+    assert report.items['removed'] == [removed]
+    assert os.path.exists(removed)
+
+
+def test_captions_not_preferred_are_not_reported_removed(http_server, monkeypatch):
+    http_server.assets['/en.vtt'] = Asset(b'WEBVTT\n', etag='"en"')
+    http_server.assets['/ru.vtt'] = Asset(b'WEBVTT\n', etag='"ru"')
+    captions = [{'language': 'en-us', 'url': http_server.url('/en.vtt')},
+                {'language': 'ru-ru', 'url': http_server.url('/ru.vtt')}]
+
+    sync_entry(monkeypatch, 'Kept', {'captions': captions})
+    report = sync_entry(monkeypatch, 'Kept', {'captions': captions}, languages=['en-us'])
+
+    assert report.items['removed'] == []
+    assert report.items['unchanged'] == [os.path.join(SUBTITLES_DIR, 'Kept_en-us.vtt')]
@@ -0,0 +1,64 @@
+from tasks import AssetResult, AssetTask, run_task, run_tasks
+
+
+class RecordingReport:
+    def __init__(self):
+        self.records = []
+
+    def record(self, status, path):
+        self.records.append((status, path))
+
+
+def test_fallback_success_is_not_reported_as_failed():
+    report = RecordingReport()
+    outcomes = {
+        'high.mp4': AssetResult(status='failed', path='high.mp4', bytes=4096, reconnects=5, error='reset'),
+        'medium.mp4': AssetResult(status='downloaded', path='medium.mp4', bytes=8192),
+    }
+    task = AssetTask('video', [('high', 'u1', 'high.mp4'), ('medium', 'u2', 'medium.mp4')])
+
+    result = run_task(task, lambda url, path, position: outcomes[path], report)
+
+    assert result.status == 'downloaded'
+    assert (result.kind, result.name, result.bytes) == ('video', 'medium', 8192)
+    assert result.reconnects == 5
+    assert report.records == []
+
+
+def test_final_failure_keeps_metrics_and_is_reported_once():
+    report = RecordingReport()
+    task = AssetTask('audio', [('audio', 'u', 'audio.mp4')])
+    failed = AssetResult(status='failed', path='audio.mp4', bytes=1234, reconnects=3, error='reset')
+
+    result = run_task(task, lambda url, path, position: failed, report)
+
+    assert not result
+    assert (result.bytes, result.reconnects) == (1234, 3)
+    assert report.records == [('failed', 'audio.mp4')]
+
+
+def test_exceptions_become_failed_results():
+    def download(url, path, position):
+        raise OSError("disk full")
+
+    result = run_task(AssetTask('captions', [('en-us', 'u', 'en.vtt')]), download)
+
+    assert result.status == 'failed' and result.error == 'disk full'
+
+
+def test_tasks_without_candidates_are_unavailable_and_results_keep_order():
+    tasks = [AssetTask('video', []), AssetTask('captions', [('en-us', 'u', 'en.vtt')])]
+
+    results = run_tasks(tasks, lambda url, path, position: AssetResult(status='downloaded', path=path), max_workers=4)
+
+    assert [r.status for r in results] == ['unavailable', 'downloaded']
+    assert results[1].name == 'en-us'
+
+
+def test_each_task_gets_its_own_progress_bar_position():
+    tasks = [AssetTask(kind, [(kind, 'u', f'{kind}.bin')]) for kind in ('video', 'audio', 'captions')]
+
+    results = run_tasks(tasks, lambda url, path, position: AssetResult(status='downloaded', path=str(position)),
+                        max_workers=3)
+
+    assert [r.path for r in results] == ['0', '1', '2']
@@ -0,0 +1,89 @@
+import os
+
+from transcript_index import connect, index_file, index_tree, parse_caption_filename, parse_vtt, search
+
+VTT = """WEBVTT
+Kind: captions
+Language: en-US
+
+NOTE This transcript was generated
+automatically and reviewed by hand.
+
+intro-1
+00:00:01.000 --> 00:00:04.500 align:start position:0%
+<v Speaker>Welcome to <b>Azure</b> Functions</v>
+
+2
+00:05.250 --> 00:07.000
+Triggers and
+<c.highlight>bindings</c>
+
+01:02:03,004 --> 01:02:05,000
+
+"""
+
+
+def test_parse_vtt_skips_headers_notes_and_identifiers():
+    assert parse_vtt(VTT) == [
+        (1000, 4500, 'Welcome to Azure Functions'),
+        (5250, 7000, 'Triggers and bindings'),
+    ]
+
+
+def test_parse_vtt_reads_hours_and_comma_decimals():
+    cues = parse_vtt("WEBVTT\n\n01:02:03,004 --> 01:02:05,000\nLate cue\n")
+
+    assert cues == [(3723004, 3725000, 'Late cue')]
+
+
+def test_parse_caption_filename_splits_on_the_last_underscore():
+    assert parse_caption_filename('/subs/Intro_to_Azure_en-us.vtt') == ('Intro_to_Azure', 'en-us')
+    assert parse_caption_filename('/subs/untitled.vtt') == ('untitled', '')
+
+
+def test_index_file_skips_unchanged_files_and_reindexes_changed_ones(tmp_path):
+    path = str(tmp_path / 'Functions_en-us.vtt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(VTT)
+    conn = connect(str(tmp_path / 'index.db'))
+    try:
+        assert index_file(conn, path) is True
+        assert index_file(conn, path) is False
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("WEBVTT\n\n00:01.000 --> 00:02.000\nDurable orchestrations\n")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert index_file(conn, path) is True
+        assert conn.execute("SELECT text FROM cues WHERE path = ?", (path,)).fetchall() == [
+            ('Durable orchestrations',)]
+    finally:
+        conn.close()
+
+
+def test_index_tree_counts_and_drops_deleted_files(tmp_path):
+    subtitles = tmp_path / 'subtitles'
+    subtitles.mkdir()
+    db_path = str(tmp_path / 'index.db')
+    for name in ('One_en-us.vtt', 'Two_de-de.vtt'):
+        (subtitles / name).write_text(VTT, encoding='utf-8')
+
+    assert index_tree(str(subtitles), db_path) == (2, 0, 0)
+    (subtitles / 'Two_de-de.vtt').unlink()
+    assert index_tree(str(subtitles), db_path) == (0, 1, 1)
+
+
+def test_search_quotes_user_input_as_plain_words(tmp_path):
+    subtitles = tmp_path / 'subtitles'
+    subtitles.mkdir()
+    db_path = str(tmp_path / 'index.db')
+    (subtitles / 'Functions_en-us.vtt').write_text(VTT, encoding='utf-8')
+    index_tree(str(subtitles), db_path)
+
+    assert search('NOT OR (', db_path=db_path) == []
+    assert search('   ', db_path=db_path) == []
+    # AND is matched as the word "and" and the stray quote is escaped rather than a syntax error
+    [result] = search('Triggers AND "bindings', db_path=db_path)
+    assert result == {'title': 'Functions', 'language': 'en-us', 'start_ms': 5250, 'end_ms': 7000,
+                      'text': 'Triggers and bindings'}
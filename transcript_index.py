@@ -0,0 +1,183 @@
+import argparse
+import os
+import re
+import sqlite3
+from config import SUBTITLES_DIR, TRANSCRIPT_INDEX_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS caption_files (
+    path TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    language TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS cues USING fts5(
+    text,
+    path UNINDEXED,
+    start_ms UNINDEXED,
+    end_ms UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+TIMESTAMP = r'(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})'
+CUE_TIMING = re.compile(TIMESTAMP + r'\s*-->\s*' + TIMESTAMP)
+TAG = re.compile(r'<[^>]*>')
+
+
+def connect(db_path=TRANSCRIPT_INDEX_PATH):
+    # One connection per call keeps the index usable from download worker threads
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _to_ms(hours, minutes, seconds, millis):
+    return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(millis)
+
+
+def parse_vtt(text):
+    """Returns a list of (start_ms, end_ms, text) cues from WebVTT content."""
+    cues = []
+    lines = text.splitlines()
+    i = 0
+    while i < len(lines):
+        match = CUE_TIMING.search(lines[i])
+        i += 1
+        if not match:
+            continue
+        start_ms = _to_ms(*match.groups()[:4])
+        end_ms = _to_ms(*match.groups()[4:])
+        text_lines = []
+        while i < len(lines) and lines[i].strip():
+            text_lines.append(TAG.sub('', lines[i]).strip())
+            i += 1
+        cue_text = ' '.join(line for line in text_lines if line)
+        if cue_text:
+            cues.append((start_ms, end_ms, cue_text))
+    return cues
+
+
+def parse_caption_filename(path):
+    """Splits '{title}_{language}.vtt' into (title, language)."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    title, _, language = name.rpartition('_')
+    return (title, language) if title else (name, '')
+
+
+def index_file(conn, path):
+    """(Re-)indexes one caption file. Returns False if it is unchanged since it was last indexed."""
+    stat = os.stat(path)
+    row = conn.execute("SELECT size, mtime_ns FROM caption_files WHERE path = ?", (path,)).fetchone()
+    if row == (stat.st_size, stat.st_mtime_ns):
+        return False
+
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        cues = parse_vtt(f.read())
+    title, language = parse_caption_filename(path)
+
+    with conn:
+        conn.execute("DELETE FROM cues WHERE path = ?", (path,))
+        conn.executemany("INSERT INTO cues (text, path, start_ms, end_ms) VALUES (?, ?, ?, ?)",
+                         [(text, path, start_ms, end_ms) for start_ms, end_ms, text in cues])
+        conn.execute("INSERT OR REPLACE INTO caption_files (path, title, language, size, mtime_ns) "
+                     "VALUES (?, ?, ?, ?, ?)", (path, title, language, stat.st_size, stat.st_mtime_ns))
+    return True
+
+
+def index_caption(path, db_path=TRANSCRIPT_INDEX_PATH):
+    """Indexes a single caption file as soon as it has been downloaded."""
+    conn = connect(db_path)
+    try:
+        return index_file(conn, path)
+    finally:
+        conn.close()
+
+
+def index_tree(directory=SUBTITLES_DIR, db_path=TRANSCRIPT_INDEX_PATH):
+    """
+    Brings the index up to date with the .vtt files under `directory`.
+    Only new or changed files are parsed; files that disappeared are dropped.
+    Returns (indexed, unchanged, removed) counts.
+    """
+    conn = connect(db_path)
+    indexed = unchanged = removed = 0
+    try:
+        found = set()
+        for dirpath, _, filenames in os.walk(directory):
+            for filename in filenames:
+                if filename.lower().endswith('.vtt'):
+                    path = os.path.join(dirpath, filename)
+                    found.add(path)
+                    if index_file(conn, path):
+                        indexed += 1
+                    else:
+                        unchanged += 1
+
+        root = os.path.join(os.path.abspath(directory), '')
+        for (path,) in conn.execute("SELECT path FROM caption_files").fetchall():
+            if os.path.abspath(path).startswith(root) and path not in found:
+                with conn:
+                    conn.execute("DELETE FROM cues WHERE path = ?", (path,))
+                    conn.execute("DELETE FROM caption_files WHERE path = ?", (path,))
+                removed += 1
+    finally:
+        conn.close()
+    return indexed, unchanged, removed
+
+
+def search(query, limit=20, db_path=TRANSCRIPT_INDEX_PATH):
+    """
+    Full-text search over indexed cues, best matches first.
+    Returns a list of dicts with title, language, start_ms, end_ms and text.
+    """
+    # Quote every word so user input is never parsed as FTS5 query syntax
+    terms = ' '.join('"' + word.replace('"', '""') + '"' for word in query.split())
+    if not terms:
+        return []
+
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT f.title, f.language, c.start_ms, c.end_ms, c.text "
+            "FROM cues c JOIN caption_files f ON f.path = c.path "
+            "WHERE cues MATCH ? ORDER BY bm25(cues) LIMIT ?",
+            (terms, limit)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [{'title': title, 'language': language, 'start_ms': start_ms, 'end_ms': end_ms, 'text': text}
+            for title, language, start_ms, end_ms, text in rows]
+
+
+def format_offset(ms):
+    seconds, millis = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Index and search downloaded captions.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    index_parser = subparsers.add_parser('index', help='Index new or changed caption files')
+    index_parser.add_argument('directory', nargs='?', default=SUBTITLES_DIR, help='Directory with .vtt files')
+
+    search_parser = subparsers.add_parser('search', help='Search the caption index')
+    search_parser.add_argument('query', type=str, help='Words to search for')
+    search_parser.add_argument('--limit', type=int, default=20, help='Maximum number of results')
+    args = parser.parse_args()
+
+    if args.command == 'index':
+        indexed, unchanged, removed = index_tree(args.directory)
+        print(f"📚 Indexed {indexed} files, {unchanged} unchanged, {removed} removed")
+    else:
+        results = search(args.query, args.limit)
+        if not results:
+            print("🔍 No matches")
+        for result in results:
+            print(f"🎬 {result['title']} [{result['language']}] @ {result['start_ms']} ms "
+                  f"({format_offset(result['start_ms'])}): {result['text']}")
@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from config import VIDEOS_DIR, AUDIOS_DIR, SUBTITLES_DIR
+from integrity import is_sidecar, is_temporary, verify_file
+
+
+def find_downloads(directories):
+    for directory in directories:
+        for dirpath, _, filenames in os.walk(directory):
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                if not is_sidecar(path) and not is_temporary(path):
+                    yield path
+
+
+def verify_tree(directories=(VIDEOS_DIR, AUDIOS_DIR, SUBTITLES_DIR), workers=None):
+    """
+    Re-hashes every downloaded file under `directories` in parallel across CPU cores
+    and compares it with the checksum and size recorded at download time.
+    Returns a dict mapping status ('ok', 'corrupt', 'unverified') to lists of (path, detail).
+    """
+    paths = list(find_downloads(directories))
+    results = {'ok': [], 'corrupt': [], 'unverified': []}
+    if not paths:
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, status, detail in executor.map(verify_file, paths):
+            results[status].append((path, detail))
+            if status == 'corrupt':
+                print(f"❌ {path}: {detail}")
+            elif status == 'unverified':
+                print(f"⚠️ {path}: {detail}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Verify downloaded files against their recorded checksums.')
+    parser.add_argument('directories', nargs='*', default=[VIDEOS_DIR, AUDIOS_DIR, SUBTITLES_DIR],
+                        help='Directories to verify (default: all download directories)')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    results = verify_tree(args.directories, args.workers)
+    print(f"🔍 Verified: {len(results['ok'])} ok, {len(results['corrupt'])} corrupt, "
+          f"{len(results['unverified'])} without checksum")
+    sys.exit(1 if results['corrupt'] else 0)